@@ -8,3 +8,7 @@ SUBGRAPH_SIZE_STD = 10 # standard deviation of number of edges in random subgrap
 RAND_EDGES_VAR = .05 # variance of number of edges randomly sampled from subgraphs
 
 GLINK_SEARCH_PATIENCE = 10 # number of attempts to find strong glink before regenerating subgraph
+VF2_EARLY_ACCEPT_RATIO = None # accept union graphs with at most this fraction of archgraph's edges without VF2 (None for exact)
+
+NUM_WORKERS = None # number of worker processes generating circuits (None for one per CPU)
+NUM_IO_THREADS = 2 # number of threads exporting circuits and results
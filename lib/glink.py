@@ -1,4 +1,4 @@
-from typing import Iterator, Optional, Self
+from typing import Iterator, Optional
 
 from .graph import Graph
 from .permutation import Permutation
@@ -6,21 +6,20 @@ from .permutation import Permutation
 
 class Glink:
     """
-    A class representing a glink. 
+    A class representing a glink.
     """
+    __slots__ = ("__graph", "__perm")
+
     __perm: Permutation
     __graph: Graph
-    __next: Self
 
     def __init__(
         self,
         graph: Graph,
-        perm: Permutation,
-        next: Optional[Self] = None
+        perm: Permutation
     ):
         self.__graph = graph
         self.__perm = perm
-        self.__next = next
 
     @property
     def graph(self) -> Optional[Graph]:
@@ -29,30 +28,19 @@ class Glink:
     @property
     def perm(self) -> Permutation:
         return self.__perm
-    
-    @property
-    def next(self) -> Optional[Self]:
-        return self.__next
-    
-    def link_to(self, glink: Self):
-        self.__next = glink
 
 
 class GlinkChain:
     """
-    A linkedlist-like class representing a glink chain.
+    A list-backed class representing a glink chain.
     """
-    __head: Glink
-    __tail: Glink
-    __size: int
+    __chain: list[Glink]
 
     def __init__(self):
-        self.__head = None
-        self.__tail = None
-        self.__size = 0
+        self.__chain = []
 
     def __len__(self) -> int:
-        return self.__size
+        return len(self.__chain)
 
     def append(self, graph: Graph, perm: Permutation):
         """
@@ -62,22 +50,16 @@ class GlinkChain:
         - `graph`: the graph of the new glink
         - `perm`: the permutation inducing the glink
         """
-        glink = Glink(graph, perm)
-        if self.__head is None:
-            self.__head = glink
-        else:
-            self.__tail.link_to(glink)
-        self.__tail = glink
-        self.__size += 1
+        self.__chain.append(Glink(graph, perm))
 
     @property
-    def head(self) -> Glink:
-        return self.__head
-    
+    def head(self) -> Optional[Glink]:
+        return self.__chain[0] if self.__chain else None
+
     @property
-    def tail(self) -> Glink:
-        return self.__tail
-    
+    def tail(self) -> Optional[Glink]:
+        return self.__chain[-1] if self.__chain else None
+
     def glinks(self) -> Iterator[Glink]:
         """
         Iterate through each glink in the chain.
@@ -85,7 +67,4 @@ class GlinkChain:
         Returns:
         - an iterator over the glinks.
         """
-        glink = self.head
-        while glink is not None:
-            yield glink
-            glink = glink.next
+        return iter(self.__chain)
@@ -1,10 +1,13 @@
 import itertools as it
+import numpy as np
 import random as rd
 
 from rustworkx import PyGraph
 from typing import Optional, Self, Sequence
 
-from .graph_data import Edge, Node
+from .graph_data import Edge, Node, sorted_edge
+
+_rng = np.random.default_rng() # default for all graphs, as seeding one per graph is costly
 
 
 class Graph:
@@ -16,18 +19,24 @@ class Graph:
     __name: str
     __i2n: dict[int, Node] # index-to-node map
     __n2i: dict[Node, int] # node-to-index map
+    __nodes: Optional[list[Node]] # cached node list (None if stale)
+    __edges: Optional[list[Edge]] # cached edge list (None if stale)
+    __edge_set: Optional[frozenset[Edge]] # cached edge set (None if stale)
+    __edge_array: Optional[np.ndarray] # cached edge index array (None if stale)
     
     def __init__(self, pygraph: PyGraph, name: str = "graph"):
 
         if pygraph.has_parallel_edges():
             raise ValueError("graph contains parallel edges")
-        if not all(isinstance(node, Node) for node in pygraph.nodes()):
-            raise ValueError("graph nodes must be of type Node")
+        if __debug__ and not all(isinstance(node, int) for node in pygraph.nodes()):
+            raise ValueError("graph nodes must be of type int")
         
         self.__pygraph = pygraph
         self.__name = name
         self.__i2n = {index: pygraph[index] for index in pygraph.node_indices()}
         self.__n2i = {pygraph[index]: index for index in pygraph.node_indices()}
+        self.__nodes = None
+        self.__clear_edge_cache()
     
     @classmethod
     def from_edges(cls, edges: list[tuple[int, int]]) -> Self:
@@ -41,26 +50,41 @@ class Graph:
         Returns:
         - a graph with provided edge list
         """
+        return cls(cls.pygraph_from_edges(edges))
+
+    @staticmethod
+    def pygraph_from_edges(edges: list[tuple[int, int]]) -> PyGraph:
+        """
+        Construct the underlying PyGraph of `Graph.from_edges`, e.g., for subclasses to
+        pass on to `Graph.__init__`.
+
+        Params:
+        - `edges`: the list of edges to construct the PyGraph from
+        
+        Returns:
+        - a PyGraph with provided edge list and consecutively indexed nodes
+        """
         # Re-index nodes and edges from edge list
         old_nodes = sorted(set(node for edge in edges for node in edge))
-        new_nodes = [Node(v) for v in range(len(old_nodes))]
-        new_edges = [
-            Edge(Node(old_nodes.index(src)), Node(old_nodes.index(dst)))
-            for src, dst in edges
-        ]
-        # Construct graph
+        new_nodes = {node: index for index, node in enumerate(old_nodes)} # old-to-new map
+        new_edges = [sorted_edge(new_nodes[src], new_nodes[dst]) for src, dst in edges]
+
+        # Construct graph (nodes are added in order, so every node is its own index)
         pygraph = PyGraph(multigraph = False)
-        pygraph.add_nodes_from(new_nodes)
-        n2i = {pygraph[index]: index for index in pygraph.node_indices()}
-        pygraph.add_edges_from([(n2i[src], n2i[dst], Edge(src, dst)) for src, dst in new_edges])
+        pygraph.add_nodes_from(list(range(len(old_nodes))))
+        pygraph.add_edges_from([(src, dst, (src, dst)) for src, dst in new_edges])
         
-        return cls(pygraph)
+        return pygraph
     
     def __eq__(self, other: Self) -> bool:
-        return set(self.nodes) == set(other.nodes) and set(self.edges) == set(other.edges)
+        if self.num_nodes != other.num_nodes or self.num_edges != other.num_edges:
+            return False
+        if self.__n2i.keys() != other.__n2i.keys():
+            return False
+        return self.__get_edge_set() == other.__get_edge_set()
     
-    def __getitem__(self, key: int | Node) -> Node | int:
-        return self.__i2n[key] if isinstance(key, int) else self.__n2i[key]
+    def __getitem__(self, node: Node) -> int:
+        return self.__n2i[node]
     
     def __repr__(self) -> str:
         return "Graph(\n" + \
@@ -74,7 +98,10 @@ class Graph:
     
     @property
     def nodes(self) -> list[Node]:
-        return self.__pygraph.nodes()
+        # The returned list is cached and should not be modified
+        if self.__nodes is None:
+            self.__nodes = self.__pygraph.nodes()
+        return self.__nodes
     
     @property
     def num_nodes(self) -> int:
@@ -86,13 +113,47 @@ class Graph:
     
     @property
     def edges(self) -> list[Edge]:
-        return self.__pygraph.edges()
+        # The returned list is cached and should not be modified
+        if self.__edges is None:
+            self.__edges = self.__pygraph.edges()
+        return self.__edges
+
+    def __get_edge_set(self) -> frozenset[Edge]:
+        if self.__edge_set is None:
+            self.__edge_set = frozenset(self.edges)
+        return self.__edge_set
+
+    def __clear_edge_cache(self) -> None:
+        self.__edges = None
+        self.__edge_set = None
+        self.__edge_array = None
+    
+    def edge_array(self) -> np.ndarray:
+        """
+        Return the edges of this graph as a read-only (num_edges, 2) array of node indices,
+        in the same order as `self.edges`.
+        """
+        if self.__edge_array is None:
+            edge_array = np.array(self.__pygraph.edge_list(), dtype = np.int32).reshape(-1, 2)
+            edge_array.flags.writeable = False
+            self.__edge_array = edge_array
+        return self.__edge_array
     
     def pygraph(self) -> PyGraph:
         return self.__pygraph
     
     def copy(self) -> Self:
-        return Graph(self.__pygraph.copy())
+        # Bypass __init__ as the copy is already valid and indexed (PyGraph.copy keeps indices)
+        graph = Graph.__new__(Graph)
+        graph.__pygraph = self.__pygraph.copy()
+        graph.__name = "graph"
+        graph.__i2n = self.__i2n.copy()
+        graph.__n2i = self.__n2i.copy()
+        graph.__nodes = self.__nodes # cached lists are never modified, only dropped
+        graph.__edges = self.__edges
+        graph.__edge_set = self.__edge_set
+        graph.__edge_array = self.__edge_array
+        return graph
     
     def add_node(self, node: Node) -> None:
         self.add_nodes([node])
@@ -102,6 +163,7 @@ class Graph:
         for node, index in zip(nodes, indices):
             self.__i2n[index] = node
             self.__n2i[node] = index
+        self.__nodes = None
 
     def remove_node(self, node: Node) -> None:
         self.remove_nodes([node])
@@ -109,16 +171,18 @@ class Graph:
     def remove_nodes(self, nodes: Sequence[Node]) -> None:
         self.__pygraph.remove_nodes_from([self[node] for node in nodes])
         for node in nodes:
-            del self.__i2n[self[node]]
-            del self.__n2i[node]
+            del self.__i2n[self.__n2i.pop(node)]
+        self.__nodes = None
+        self.__clear_edge_cache()
 
     def add_edge(self, edge: Edge) -> None:
         self.add_edges([edge])
 
     def add_edges(self, edges: Sequence[Edge]) -> None:
         self.__pygraph.add_edges_from([
-            (self[src], self[dst], Edge(src, dst)) for src, dst in edges
+            (self[src], self[dst], sorted_edge(src, dst)) for src, dst in edges
         ])
+        self.__clear_edge_cache()
 
     def remove_edge(self, edge: Edge) -> None:
         self.remove_edges([edge])
@@ -127,35 +191,56 @@ class Graph:
         self.__pygraph.remove_edges_from([
             (self[src], self[dst]) for src, dst in edges
         ])
+        self.__clear_edge_cache()
 
     def has_node(self, node: Node) -> bool:
         return node in self.__n2i
     
     def has_edge(self, src: Node, dst: Node) -> bool:
-        if not (self.has_node(src) and self.has_node(dst)):
+        n2i = self.__n2i
+        if not (src in n2i and dst in n2i):
             return False
-        return self.__pygraph.has_edge(self[src], self[dst])
+        return self.__pygraph.has_edge(n2i[src], n2i[dst])
+    
+    def neighbour_ids(self, node: Node) -> list[int]:
+        return self.__pygraph.neighbors(self.__n2i[node]) # indices, not nodes
     
     def neighbours(self, node: Node) -> list[Node]:
-        return [self[index] for index in self.__pygraph.neighbors(self[node])]
+        i2n = self.__i2n
+        return [i2n[index] for index in self.__pygraph.neighbors(self.__n2i[node])]
     
     def incident_edges(self, src: Node) -> list[Edge]:
-        return [Edge(src, dst) for dst in self.neighbours(src)]
+        return [sorted_edge(src, dst) for dst in self.neighbours(src)]
+    
+    def degree_sequence(self) -> list[int]:
+        pygraph = self.__pygraph
+        return sorted(map(pygraph.degree, pygraph.node_indices()), reverse = True)
     
-    def random_subgraph(self, num_edges: int) -> Self:
+    def random_subgraph(
+        self,
+        num_edges: int,
+        rng: Optional[np.random.Generator] = None
+    ) -> Self:
         """
         Generate a random edge-induced subgraph with the specified number of edges.
         
         Params:
         - `num_edges`: number of edges in the generated subgraph
+        - `rng`: random number generator to sample with (shared default if None)
 
         Returns:
         - random edge-induced subgraph of this graph
         """
-        edges = [(self[src], self[dst]) for src, dst in rd.sample(self.edges, num_edges)]
-        return Graph(self.__pygraph.edge_subgraph(edges))
+        rng = _rng if rng is None else rng
+        indices = rng.choice(self.num_edges, size = num_edges, replace = False)
+        return Graph(self.__pygraph.edge_subgraph(self.edge_array()[indices].tolist()))
     
-    def random_nodes(self, num_nodes: int, include_all: bool = False) -> list[Node]:
+    def random_nodes(
+        self,
+        num_nodes: int,
+        include_all: bool = False,
+        rng: Optional[np.random.Generator] = None
+    ) -> list[Node]:
         """
         Randomly pick nodes from this graph with replacement. 
 
@@ -163,6 +248,7 @@ class Graph:
         - `num_nodes`: number of nodes to sample
         - `include_all`: if this is True then the returned list is guaranteed to include
         every node in the graph at least once
+        - `rng`: random number generator to sample with (shared default if None)
 
         Returns:
         - list of randomly sampled nodes
@@ -170,15 +256,20 @@ class Graph:
         if include_all and num_nodes < self.num_nodes:
             raise ValueError("cannot ensure every node is included with given num_nodes")
         
-        nodes = []
+        rng = _rng if rng is None else rng
+        nodes = self.nodes
+        indices = rng.integers(len(nodes), size = num_nodes)
         if include_all:
-            nodes += rd.sample(self.nodes, self.num_nodes)
-            num_nodes -= self.num_nodes
-        nodes += rd.choices(self.nodes, k = num_nodes)
+            indices[:len(nodes)] = rng.permutation(len(nodes))
 
-        return nodes
+        return [nodes[index] for index in indices.tolist()]
     
-    def random_edges(self, num_edges: int, include_all: bool = True) -> list[Edge]:
+    def random_edges(
+        self,
+        num_edges: int,
+        include_all: bool = True,
+        rng: Optional[np.random.Generator] = None
+    ) -> list[Edge]:
         """
         Randomly pick edges from this graph with replacement. 
 
@@ -186,6 +277,7 @@ class Graph:
         - `n`: number of edges to sample
         - `include_all`: if this is True then the returned list is guaranteed to include
         every edge in the graph at least once
+        - `rng`: random number generator to sample with (shared default if None)
 
         Returns:
         - list of randomly sampled edges
@@ -193,13 +285,13 @@ class Graph:
         if include_all and num_edges < self.num_edges:
             raise ValueError("cannot ensure every edge is included with given num_edges")
         
-        edges = []
+        rng = _rng if rng is None else rng
+        edges = self.edges
+        indices = rng.integers(len(edges), size = num_edges)
         if include_all:
-            edges += rd.sample(self.edges, self.num_edges)
-            num_edges -= self.num_edges
-        edges += rd.choices(self.edges, k = num_edges)
+            indices[:len(edges)] = rng.permutation(len(edges))
 
-        return edges
+        return [edges[index] for index in indices.tolist()]
     
     def permute(self, src: Node, dst: Node, inplace: bool = False) -> Optional[Self]:
         """
@@ -213,9 +305,6 @@ class Graph:
         Returns:
         - permuted graph if `inplace` is False
         """
-        if isinstance(src, int) or isinstance(dst, int):
-            raise ValueError("src and dst should be of type Node")
-        
         # Do not permute if neither src nor dst exists in graph
         if not (self.has_node(src) or self.has_node(dst)):
             return self.copy() if not inplace else None
@@ -235,17 +324,28 @@ class Graph:
             this.add_node(dst)
             dst_is_external = True
         
-        # Obtain neighbours of src and dst
-        src_neighbors = set(this.neighbours(src)) - {dst}
-        dst_neighbors = set(this.neighbours(dst)) - {src}
+        # Work on indices directly to avoid translating nodes back and forth
+        pygraph, i2n = this.__pygraph, this.__i2n
+        src_index, dst_index = this.__n2i[src], this.__n2i[dst]
+
+        # Obtain (indices of) neighbours of src and dst, excluding each other
+        src_neighbors = this.neighbour_ids(src)
+        dst_neighbors = this.neighbour_ids(dst)
+        if pygraph.has_edge(src_index, dst_index):
+            src_neighbors = [ngb for ngb in src_neighbors if ngb != dst_index]
+            dst_neighbors = [ngb for ngb in dst_neighbors if ngb != src_index]
         
         # Disconnect u and v from their neighbours
-        this.remove_edges([Edge(src, ngb) for ngb in src_neighbors])
-        this.remove_edges([Edge(dst, ngb) for ngb in dst_neighbors])
-        
+        pygraph.remove_edges_from(
+            [(src_index, ngb) for ngb in src_neighbors] +
+            [(dst_index, ngb) for ngb in dst_neighbors]
+        )
         # Connect u to v's neighbours and v to u's neighbours
-        this.add_edges([Edge(dst, ngb) for ngb in src_neighbors])
-        this.add_edges([Edge(src, ngb) for ngb in dst_neighbors])
+        pygraph.add_edges_from(
+            [(dst_index, ngb, sorted_edge(dst, i2n[ngb])) for ngb in src_neighbors] +
+            [(src_index, ngb, sorted_edge(src, i2n[ngb])) for ngb in dst_neighbors]
+        )
+        this.__clear_edge_cache()
 
         # Remove its counterpart after permuting if a node was external
         if src_is_external:
@@ -271,9 +371,11 @@ class Graph:
         if not inplace:
             this = this.copy()
         
-        # Add union of nodes and edges
-        this.add_nodes(list(set(other.nodes) - set(this.nodes)))
-        this.add_edges(other.edges)
+        # Add union of nodes and edges (edges of other are already sorted)
+        this.add_nodes(list(other.__n2i.keys() - this.__n2i.keys()))
+        n2i = this.__n2i
+        this.__pygraph.add_edges_from([(n2i[src], n2i[dst], (src, dst)) for src, dst in other.edges])
+        this.__clear_edge_cache()
 
         if not inplace:
             return this
@@ -288,7 +390,7 @@ if __name__ == "__main__":
         rd.sample(list(it.combinations(range(10), 2)), k = 10)
     )
     # Test permute
-    src, dst = Node(0), Node(5)
+    src, dst = 0, 5
     swapped_graph = graph1.permute(src, dst)
     if graph1.neighbours(src) != graph1.neighbours(dst):
         assert graph1 != swapped_graph
@@ -296,12 +398,12 @@ if __name__ == "__main__":
     assert len(graph1.edges) == len(swapped_graph.edges)
     for i in range(len(graph1.edges)):
         src, dst = graph1.edges[i]
-        if len({src.__val, dst.__val} & {0, 5}) in (0, 2):
+        if len({src, dst} & {0, 5}) in (0, 2):
             continue
-        if src.__val in (0, 5):
-            assert swapped_graph.has_edge(Node(({0, 5} - {src.__val}).pop()), dst)
+        if src in (0, 5):
+            assert swapped_graph.has_edge(({0, 5} - {src}).pop(), dst)
         else:
-            assert swapped_graph.has_edge(src, Node(({0, 5} - {dst.__val}).pop()))
+            assert swapped_graph.has_edge(src, ({0, 5} - {dst}).pop())
 
     # Test union
     graph2 = Graph.from_edges([(0, 1), (1, 3), (2, 4), (3, 5)])
@@ -1,9 +1,61 @@
+import functools
+
 from rustworkx import generators
 
 from .graph import Graph
 
-
+TOKYO_EDGES = sorted([
+    ( 0,  1), ( 1,  2), ( 2,  3), ( 3,  4),
+    ( 0,  5), ( 1,  6), ( 1,  7), ( 2,  6), ( 2,  7), ( 3,  8), ( 3,  9), ( 4,  8), ( 4,  9),
+    ( 5,  6), ( 6,  7), ( 7,  8), ( 8,  9),
+    ( 5, 10), ( 5, 11), ( 6, 10), ( 6, 11), ( 7, 12), ( 7, 13), ( 8, 12), ( 8, 13), ( 9, 14),
+    (10, 11), (11, 12), (12, 13), (13, 14),
+    (10, 15), (11, 16), (11, 17), (12, 16), (12, 17), (13, 18), (13, 19), (14, 18), (14, 19),
+    (15, 16), (16, 17), (17, 18), (18, 19)
+])
+
+ROCHESTER_EDGES = sorted([
+    ( 0,  1), ( 1,  2), ( 2,  3), ( 3,  4),
+    ( 0,  5), ( 4,  6),
+    ( 5,  9), ( 6, 13),
+    ( 7,  8), ( 8,  9), ( 9, 10), (10, 11), (11, 12), (12, 13), (13, 14), (14, 15),
+    ( 7, 16), (11, 17), (15, 18),
+    (16, 19), (17, 23), (18, 27),
+    (19, 20), (20, 21), (21, 22), (22, 23), (23, 24), (24, 25), (25, 26), (26, 27),
+    (21, 28), (25, 29),
+    (28, 32), (29, 36),
+    (30, 31), (31, 32), (32, 33), (33, 34), (34, 35), (35, 36), (36, 37), (37, 38),
+    (30, 39), (34, 40), (38, 41),
+    (39, 42), (40, 46), (41, 50),
+    (42, 43), (43, 44), (44, 45), (45, 46), (46, 47), (47, 48), (48, 49), (49, 50),
+    (44, 51), (48, 52)
+])
+
+SYCAMORE54_EDGES = sorted([
+    ( 0,  6), ( 1,  6), ( 1,  7), ( 2,  7), ( 2,  8), ( 3,  8), ( 3,  9), ( 4,  9), ( 4, 10), ( 5, 10), ( 5, 11),
+    ( 6, 12), ( 6, 13), ( 7, 13), ( 7, 14), ( 8, 14), ( 8, 15), ( 9, 15), ( 9, 16), (10, 16), (10, 17), (11, 17),
+    (12, 18), (13, 18), (13, 19), (14, 19), (14, 20), (15, 20), (15, 21), (16, 21), (16, 22), (17, 22), (17, 23),
+    (18, 24), (18, 25), (19, 25), (19, 26), (20, 26), (20, 27), (21, 27), (21, 28), (22, 28), (22, 29), (23, 29),
+    (24, 30), (25, 30), (25, 31), (26, 31), (26, 32), (27, 32), (27, 33), (28, 33), (28, 34), (29, 34), (29, 35),
+    (30, 36), (30, 37), (31, 37), (31, 38), (32, 38), (32, 39), (33, 39), (33, 40), (34, 40), (34, 41), (35, 41),
+    (36, 42), (37, 42), (37, 43), (37, 43), (38, 44), (39, 44), (39, 45), (40, 45), (40, 46), (41, 46), (41, 47),
+    (42, 48), (42, 49), (43, 49), (43, 50), (44, 50), (44, 51), (45, 51), (45, 52), (46, 52), (46, 53), (47, 53)
+])
+
+
+@functools.cache
 def graph_from_name(name: str, **kwargs) -> Graph:
+    """
+    Construct the graph with the given name. Graphs are cached by name and arguments, so
+    repeated calls return the same (shared) graph, which should not be modified.
+
+    Params:
+    - `name`: name of the graph
+    - `kwargs`: arguments of the graph (e.g., `num_nodes`), if any
+
+    Returns:
+    - the named graph
+    """
 
     match name.lower():
         case "grid":
@@ -32,7 +84,7 @@ class Grid(Graph):
     """
     def __init__(self, rows: int, cols: int):
         edges = generators.grid_graph(rows, cols).edge_list()
-        grid = Graph.from_edges(edges).pygraph()
+        grid = Graph.pygraph_from_edges(edges)
         super().__init__(grid, f"grid({rows}, {cols})")
 
 
@@ -42,7 +94,7 @@ class Line(Graph):
     """
     def __init__(self, num_nodes: int):
         edges = generators.path_graph(num_nodes).edge_list()
-        line = Graph.from_edges(edges).pygraph()
+        line = Graph.pygraph_from_edges(edges)
         super().__init__(line, f"line({num_nodes})")
 
 
@@ -52,7 +104,7 @@ class Ring(Graph):
     """
     def __init__(self, num_nodes: int):
         edges = generators.cycle_graph(num_nodes).edge_list()
-        ring = Graph.from_edges(edges).pygraph()
+        ring = Graph.pygraph_from_edges(edges)
         super().__init__(ring, f"ring({num_nodes})")
 
 
@@ -62,7 +114,7 @@ class Star(Graph):
     """
     def __init__(self, num_nodes: int):
         edges = generators.star_graph(num_nodes).edge_list()
-        star = Graph.from_edges(edges).pygraph()
+        star = Graph.pygraph_from_edges(edges)
         super().__init__(star, f"star({num_nodes})")
 
 
@@ -71,17 +123,7 @@ class Tokyo(Graph):
     IBM Q Tokyo (20 qubits).
     """
     def __init__(self):
-
-        edges = sorted([
-            ( 0,  1), ( 1,  2), ( 2,  3), ( 3,  4),
-            ( 0,  5), ( 1,  6), ( 1,  7), ( 2,  6), ( 2,  7), ( 3,  8), ( 3,  9), ( 4,  8), ( 4,  9),
-            ( 5,  6), ( 6,  7), ( 7,  8), ( 8,  9),
-            ( 5, 10), ( 5, 11), ( 6, 10), ( 6, 11), ( 7, 12), ( 7, 13), ( 8, 12), ( 8, 13), ( 9, 14),
-            (10, 11), (11, 12), (12, 13), (13, 14),
-            (10, 15), (11, 16), (11, 17), (12, 16), (12, 17), (13, 18), (13, 19), (14, 18), (14, 19),
-            (15, 16), (16, 17), (17, 18), (18, 19)
-        ])
-        tokyo = Graph.from_edges(edges).pygraph()
+        tokyo = Graph.pygraph_from_edges(TOKYO_EDGES)
         super().__init__(tokyo, "tokyo")
 
 
@@ -90,24 +132,7 @@ class Rochester(Graph):
     IBM Q Rochester (53 qubits).
     """
     def __init__(self):
-
-        edges = sorted([
-            ( 0,  1), ( 1,  2), ( 2,  3), ( 3,  4),
-            ( 0,  5), ( 4,  6),
-            ( 5,  9), ( 6, 13),
-            ( 7,  8), ( 8,  9), ( 9, 10), (10, 11), (11, 12), (12, 13), (13, 14), (14, 15),
-            ( 7, 16), (11, 17), (15, 18),
-            (16, 19), (17, 23), (18, 27),
-            (19, 20), (20, 21), (21, 22), (22, 23), (23, 24), (24, 25), (25, 26), (26, 27),
-            (21, 28), (25, 29),
-            (28, 32), (29, 36),
-            (30, 31), (31, 32), (32, 33), (33, 34), (34, 35), (35, 36), (36, 37), (37, 38),
-            (30, 39), (34, 40), (38, 41),
-            (39, 42), (40, 46), (41, 50),
-            (42, 43), (43, 44), (44, 45), (45, 46), (46, 47), (47, 48), (48, 49), (49, 50),
-            (44, 51), (48, 52)
-        ])
-        rochester = Graph.from_edges(edges).pygraph()
+        rochester = Graph.pygraph_from_edges(ROCHESTER_EDGES)
         super().__init__(rochester, "rochester")
 
 
@@ -116,18 +141,7 @@ class Sycamore54(Graph):
     Google Sycamore (54 qubits).
     """
     def __init__(self):
-
-        edges = sorted([
-            ( 0,  6), ( 1,  6), ( 1,  7), ( 2,  7), ( 2,  8), ( 3,  8), ( 3,  9), ( 4,  9), ( 4, 10), ( 5, 10), ( 5, 11),
-            ( 6, 12), ( 6, 13), ( 7, 13), ( 7, 14), ( 8, 14), ( 8, 15), ( 9, 15), ( 9, 16), (10, 16), (10, 17), (11, 17),
-            (12, 18), (13, 18), (13, 19), (14, 19), (14, 20), (15, 20), (15, 21), (16, 21), (16, 22), (17, 22), (17, 23),
-            (18, 24), (18, 25), (19, 25), (19, 26), (20, 26), (20, 27), (21, 27), (21, 28), (22, 28), (22, 29), (23, 29),
-            (24, 30), (25, 30), (25, 31), (26, 31), (26, 32), (27, 32), (27, 33), (28, 33), (28, 34), (29, 34), (29, 35),
-            (30, 36), (30, 37), (31, 37), (31, 38), (32, 38), (32, 39), (33, 39), (33, 40), (34, 40), (34, 41), (35, 41),
-            (36, 42), (37, 42), (37, 43), (37, 43), (38, 44), (39, 44), (39, 45), (40, 45), (40, 46), (41, 46), (41, 47),
-            (42, 48), (42, 49), (43, 49), (43, 50), (44, 50), (44, 51), (45, 51), (45, 52), (46, 52), (46, 53), (47, 53)
-        ])
-        sycamore54 = Graph.from_edges(edges).pygraph()
+        sycamore54 = Graph.pygraph_from_edges(SYCAMORE54_EDGES)
         super().__init__(sycamore54, "sycamore54")
 
 
@@ -136,11 +150,8 @@ class Sycamore(Graph):
     Google Sycamore (53 qubits).
     """
     def __init__(self):
-
-        sycamore54 = Sycamore54().pygraph()
-        sycamore54.remove_node(3) # remove bad qubit
-        edges = sycamore54.edges()
-        sycamore53 = Graph.from_edges(edges).pygraph()
+        edges = [edge for edge in SYCAMORE54_EDGES if 3 not in edge] # remove bad qubit
+        sycamore53 = Graph.pygraph_from_edges(edges)
         super().__init__(sycamore53, "sycamore")
 
 
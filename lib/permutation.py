@@ -1,8 +1,8 @@
-import random as rd
+import numpy as np
 
 from typing import Optional, Self, Sequence
 
-from .graph_data import Node, Edge
+from .graph_data import Edge, Node
 
 
 def formatted(src: Node, dst: Node):
@@ -13,65 +13,91 @@ class Permutation:
     """
     A dict-like object representing a permutation of nodes.
     """
+    __slots__ = ("__perm", "__type", "__sigma", "__support", "__is_identity")
+
     __perm: tuple[Edge]
+    __type: str
+    __sigma: Optional[dict[Node, Node]] # cached mapping of map-type permutation
+    __support: Optional[frozenset[Node]] # cached nodes involved in permutation
+    __is_identity: Optional[bool] # cached result of is_identity
 
     def __init__(self, *perm: Edge, type: str = "map"):
         if type not in ("map", "swap"):
             return ValueError(f"invalid type '{type}'")
         self.__type = type
         self.__perm = perm
+        self.__sigma = None
+        self.__support = None
+        self.__is_identity = None
 
     @classmethod
     def identity(cls) -> Self:
         return cls()
 
     @classmethod
-    def random(cls, original: Sequence[Node]) -> Self:
-        perm = zip(original, rd.sample(original, len(original)))
-        return cls(*(Edge(src, dst) for src, dst in perm))
+    def random(cls, original: Sequence[Node], rng: Optional[np.random.Generator] = None) -> Self:
+        rng = np.random.default_rng() if rng is None else rng
+        return cls(*zip(original, [original[index] for index in rng.permutation(len(original)).tolist()]))
 
     def __len__(self) -> int:
         return len(self.__perm)
     
     def __repr__(self) -> str:
         return "Permutation(\n  {}\n)".format(
-            "\n  ".join(str(edge) for edge in self.__perm)
+            "\n  ".join(f"{src}-{dst}" for src, dst in self.__perm)
         )
     
-    def __getitem__(self, key: Node | int) -> Node:
-        if isinstance(key, int):
-            key = Node(key)
-        return self.dict()[key]
+    def __getitem__(self, key: Node) -> Node:
+        return self.__get_sigma()[key]
     
     @property
     def type(self) -> str:
         return self.__type
     
+    @property
+    def support(self) -> frozenset[Node]:
+        # Nodes appearing in the permutation, whether or not they are moved
+        if self.__support is None:
+            self.__support = frozenset(node for edge in self.__perm for node in edge)
+        return self.__support
+    
+    @property
+    def is_identity(self) -> bool:
+        if self.__is_identity is None:
+            if self.type == "map":
+                self.__is_identity = all(src == dst for src, dst in self.__perm)
+            else:
+                # Swaps may cancel out, so apply them to the nodes they involve
+                support = list(dict.fromkeys(node for edge in self.__perm for node in edge))
+                self.__is_identity = self.__apply_swap(support) == support
+        return self.__is_identity
+    
     def keys(self) -> list[Node]:
-        return [src for src, _ in self.items()]
+        return [src for src, _ in self.__perm]
     
     def values(self) -> list[Node]:
-        return [dst for _, dst in self.items()]
+        return [dst for _, dst in self.__perm]
     
     def items(self) -> tuple[Edge]:
         return self.__perm
     
+    def __get_sigma(self) -> dict[Node, Node]:
+        if self.__sigma is None:
+            self.__sigma = dict(self.__perm)
+        return self.__sigma
+    
     def __apply_map(
         self,
         original: Sequence[Node],
         inplace: bool = False
     ) -> Optional[list[Node]]:
         
-        sigma = {src: dst for src, dst in self.items()}
-        permuted = original if inplace else original.copy()
-        
-        for i, node in enumerate(original):
-            if node not in sigma:
-                continue
-            permuted[i] = sigma[node]
+        sigma = self.__get_sigma()
+        permuted = [sigma.get(node, node) for node in original]
 
         if not inplace:
             return permuted
+        original[:] = permuted
     
     def __apply_swap(
         self,
@@ -79,7 +105,7 @@ class Permutation:
         inplace: bool = False
     ) -> Optional[list[Node]]:
         
-        sigma = {node: original.index(node) for node in original}
+        sigma = {node: index for index, node in enumerate(original)}
         permuted = original if inplace else original.copy()
 
         for src, dst in self.items():
@@ -1,15 +1,15 @@
 import math
-import random as rd
+import numpy as np
 import time
 import warnings
 
 from qiskit import QuantumCircuit
 from qiskit.circuit import CircuitError
-from typing import Iterator
+from typing import Iterator, Optional
 
 from .glink import GlinkChain
 from .graph import Graph
-from .graph_data import Edge
+from .graph_data import Edge, Node, sorted_edge
 from .permutation import Permutation
 from .utils import *
 from config import *
@@ -21,6 +21,13 @@ class QUEKNO:
     __archgraph: Graph
     __subgraph_size: SubgraphSize
     __qbg_ratio: QBGRatio
+    __incident_edges: dict[Node, set[Edge]] # edges incident to each node
+    __adjacent_edges: dict[Edge, tuple[Edge, ...]] # edges sharing a node with each edge
+    __edge_order: dict[Edge, int] # position of each edge in archgraph.edges
+    __neighbour_bits: dict[Node, int] # bitmask of the neighbours of each node
+    __degree_sequence: list[int] # degrees of archgraph in descending order
+    __vf2_cache: dict[frozenset[Edge], bool] # VF2 results of union graphs in archgraph
+    __rng: np.random.Generator # all random draws are made from this generator
 
     def __init__(
         self,
@@ -28,71 +35,112 @@ class QUEKNO:
         target_cost: int,
         archgraph: Graph,
         subgraph_size: SubgraphSize,
-        qbg_ratio: QBGRatio
+        qbg_ratio: QBGRatio,
+        seed: Optional[int] = None
     ):
         self.__opt_type = opt_type
         self.__target_cost = target_cost
-        self.__archgraph = archgraph
+        self.archgraph = archgraph
         self.__subgraph_size = subgraph_size
         self.__qbg_ratio = qbg_ratio
+        self.__rng = np.random.default_rng(seed)
     
     @property
     def opt_type(self) -> OptType:
         return self.__opt_type
     
+    @opt_type.setter
+    def opt_type(self, opt_type: OptType):
+        self.__opt_type = opt_type
+    
     @property
     def target_cost(self) -> int:
         return self.__target_cost
     
+    @target_cost.setter
+    def target_cost(self, target_cost: int):
+        self.__target_cost = target_cost
+    
     @property
     def archgraph(self) -> Graph:
         return self.__archgraph
     
+    @archgraph.setter
+    def archgraph(self, archgraph: Graph):
+        self.__archgraph = archgraph
+
+        # Precompute incident edges of every node, and from these the candidate second swaps
+        # of every (first) swap for consecutive swaps (kept in the order of archgraph.edges, as
+        # set order varies between runs)
+        incident_edges = {node: set(archgraph.incident_edges(node)) for node in archgraph.nodes}
+        self.__incident_edges = incident_edges
+        self.__edge_order = {edge: index for index, edge in enumerate(archgraph.edges)}
+        self.__adjacent_edges = {
+            edge: tuple(sorted(
+                (incident_edges[edge[0]] | incident_edges[edge[1]]) - {edge},
+                key = self.__edge_order.__getitem__
+            ))
+            for edge in archgraph.edges
+        }
+        self.__neighbour_bits = {
+            node: sum(1 << neighbour for neighbour in archgraph.neighbours(node))
+            for node in archgraph.nodes
+        }
+        self.__degree_sequence = archgraph.degree_sequence()
+        self.__vf2_cache = {} # cached results only hold for the same archgraph
+    
     @property
     def subgraph_size(self) -> int:
         return self.__subgraph_size.value
     
+    @subgraph_size.setter
+    def subgraph_size(self, subgraph_size: SubgraphSize):
+        self.__subgraph_size = subgraph_size
+    
     @property
     def qbg_ratio(self) -> float:
         return self.__qbg_ratio.value
+    
+    @qbg_ratio.setter
+    def qbg_ratio(self, qbg_ratio: QBGRatio):
+        self.__qbg_ratio = qbg_ratio
 
     def random_subgraph(self) -> Graph:
         """
         Generate a random subgraph with average number of edges as per `self.subgraph_size`.
         """
-        num_edges = math.ceil(rd.gauss(self.subgraph_size, SUBGRAPH_SIZE_STD))
+        num_edges = math.ceil(self.__rng.normal(self.subgraph_size, SUBGRAPH_SIZE_STD))
         num_edges = max(num_edges, 1)
         num_edges = min(num_edges, self.archgraph.num_edges)
-        return self.archgraph.random_subgraph(num_edges)
+        return self.archgraph.random_subgraph(num_edges, rng = self.__rng)
 
     def __consecutive_permutations(self, num_swaps: int) -> Iterator[Permutation]:
 
         if num_swaps not in (1, 2):
             raise ValueError("num_swaps needs to be either 1 or 2")
         
-        edges1 = self.archgraph.edges
-        rd.shuffle(edges1)
-        
-        for src1, dst1 in edges1:
+        edges = self.archgraph.edges
+        for index in self.__rng.permutation(len(edges)).tolist():
+            src1, dst1 = edges[index]
             
             # For opt1, we can return straight away
             if num_swaps == 1:
-                yield Permutation(Edge(src1, dst1), type = "swap")
+                yield Permutation((src1, dst1), type = "swap")
                 continue
             
             # Generate consecutive swaps
-            src1_inc_edges = set(self.archgraph.incident_edges(src1))
-            dst1_inc_edges = set(self.archgraph.incident_edges(dst1))
-            edges2 = list((src1_inc_edges | dst1_inc_edges) - {Edge(src1, dst1)})
-            rd.shuffle(edges2)
+            edges2 = self.__adjacent_edges[sorted_edge(src1, dst1)]
+            order = self.__rng.permutation(len(edges2)).tolist()
+            coins = (self.__rng.random(len(edges2)) < .5 + CONSEC_SWAPS_BIAS).tolist()
             
             # For opt2, we randomly choose to include a second consecutive swap
-            for src2, dst2 in edges2:
-                num_swaps = rd.choices((1, 2), (.5 - CONSEC_SWAPS_BIAS, .5 + CONSEC_SWAPS_BIAS))[0]
+            for index2, coin in zip(order, coins):
+                src2, dst2 = edges2[index2]
+                num_swaps = 2 if coin else 1
 
                 # Select one swap
                 if num_swaps == 1:
-                    yield Permutation(Edge(src1, dst1), type = "swap")
+                    yield Permutation((src1, dst1), type = "swap")
                     continue
                 
                 # Select two swaps
@@ -103,21 +151,27 @@ class QUEKNO:
                     src2, dst2 = dst2, src2
                 elif dst1 == dst2:
                     src2, dst2 = dst2, src2
-                yield Permutation(Edge(src1, dst1), Edge(src2, dst2), type = "swap")
+                yield Permutation((src1, dst1), (src2, dst2), type = "swap")
 
     def __parallel_permutations(self) -> Iterator[Permutation]:
 
+        edges = self.archgraph.edges
         while True:
-        
-            cand_edges = self.archgraph.edges # candidate edges
-            parallel_edges = {rd.choice(cand_edges)} # selected parallel edges
-            cand_edges += [Edge.null()] # add a null edge for random early break
 
-            while cand_edges:
-                cand_edges = [edge for edge in cand_edges if is_disjoint({edge} | parallel_edges)]
-                if (edge := rd.choice(cand_edges)).is_null: # stop selecting more edges
-                    break
-                parallel_edges.add(edge)
+            # Visiting edges in a random order and taking each one disjoint from those already
+            # selected is equivalent to repeatedly choosing a random disjoint edge; the first
+            # edge is always selected, and selection stops early at a random point
+            order = self.__rng.permutation(len(edges))
+            stop = 1 + self.__rng.integers(len(edges))
+
+            parallel_edges = [] # selected parallel edges
+            parallel_nodes = 0 # bitmask of selected nodes
+            for index in order[:stop].tolist():
+                edge = edges[index]
+                edge_nodes = (1 << edge[0]) | (1 << edge[1])
+                if not edge_nodes & parallel_nodes:
+                    parallel_edges.append(edge)
+                    parallel_nodes |= edge_nodes
             
             yield Permutation(*parallel_edges, type = "swap")
 
@@ -167,7 +221,14 @@ class QUEKNO:
                     next_perm = next(perms)
                 except StopIteration:
                     break # if all perms have been exhausted, regenerate dst_subgraph
-                if (done := is_strong_glink(self.archgraph, prev_subgraph, next_subgraph, next_perm)):
+                if (done := is_strong_glink(
+                    self.archgraph,
+                    prev_subgraph,
+                    next_subgraph,
+                    next_perm,
+                    self.__degree_sequence,
+                    self.__vf2_cache
+                )):
                     break
         
         return next_subgraph, next_perm
@@ -186,7 +247,7 @@ class QUEKNO:
         # Intialise first permutation and subgraph
         chain.append(
             graph = self.random_subgraph(),
-            perm = Permutation.random(self.archgraph.nodes)
+            perm = Permutation.random(self.archgraph.nodes, rng = self.__rng)
         )
         # No need to add more glinks if target cost is 0
         if self.target_cost == 0:
@@ -214,46 +275,53 @@ class QUEKNO:
         """
         circuit = QuantumCircuit(self.archgraph.num_nodes)
         original = self.archgraph.nodes # current permutation of AG nodes
+        original_pos = {node: index for index, node in enumerate(original)} # inverse of original
         
-        for glink in glink_chain.glinks():
+        for i, glink in enumerate(glink_chain.glinks()):
 
             # Apply the permutation inducing glink
-            permuted = glink.perm.apply(original)
-            if permuted == original:
+            if glink.perm.is_identity:
                 raise ValueError(f"identity permutation: {glink.perm}")
+            permuted = glink.perm.apply(original)
+            permuted_pos = {node: index for index, node in enumerate(permuted)}
 
-            # Retrieve edges that will be affected by the permutation
+            # Retrieve edges that will be affected by the permutation (only edges incident to
+            # permuted nodes can be affected; these are kept in the order of archgraph.edges)
+            perm_nodes = glink.perm.support
+            perm_edges = {edge for node in perm_nodes for edge in self.__incident_edges[node]}
             front_gates = []
-            for edge in self.archgraph.edges:
-                original_edge = {original.index(node) for node in edge}
-                permuted_edge = {permuted.index(node) for node in edge}
+            for edge in sorted(perm_edges, key = self.__edge_order.__getitem__):
+                original_edge = {original_pos[node] for node in edge}
+                permuted_edge = {permuted_pos[node] for node in edge}
                 if original_edge == permuted_edge:
                     continue
                 front_gates.append(edge)
 
             # Sample random edges in subgraph for 2-qubit gates
-            num_back_2qbgs = math.ceil(glink.graph.num_edges * (1 + RAND_EDGES_VAR * rd.randint(1, 4)))
-            back_2qbgs = glink.graph.random_edges(num_back_2qbgs, include_all = True)
+            num_back_2qbgs = math.ceil(
+                glink.graph.num_edges * (1 + RAND_EDGES_VAR * self.__rng.integers(1, 5))
+            )
+            back_2qbgs = glink.graph.random_edges(num_back_2qbgs, include_all = True, rng = self.__rng)
 
             # Sample random nodes in subgraph for 1-qubit gates
             num_back_1qbgs = math.ceil((len(front_gates) + len(back_2qbgs)) * self.qbg_ratio)
-            back_1qbgs = glink.graph.random_nodes(num_back_1qbgs, include_all = False)
+            back_1qbgs = glink.graph.random_nodes(num_back_1qbgs, include_all = False, rng = self.__rng)
 
             # Generate gate list
             back_gates = back_2qbgs + back_1qbgs
-            rd.shuffle(back_gates)
+            back_gates = [back_gates[index] for index in self.__rng.permutation(len(back_gates)).tolist()]
             gate_list = front_gates + back_gates
 
             # Add gates to circuit
             for gate in gate_list:
-                gate_type = TWO_QUBIT_GATE if isinstance(gate, Edge) else ONE_QUBIT_GATE
-                gate = gate if isinstance(gate, Edge) else [gate]
-                circuit.append(gate_type, tuple(map(permuted.index, gate)))
-            if add_barriers and glink.next is not None:
+                gate_type = TWO_QUBIT_GATE if isinstance(gate, tuple) else ONE_QUBIT_GATE
+                gate = gate if isinstance(gate, tuple) else [gate]
+                circuit.append(gate_type, tuple(permuted_pos[node] for node in gate))
+            if add_barriers and i < len(glink_chain) - 1:
                 circuit.barrier()
 
             # Update current permutation
-            original = permuted
+            original, original_pos = permuted, permuted_pos
 
         return circuit
     
@@ -276,7 +344,8 @@ class QUEKNO:
         Returns:
         - the transformed circuit
         """
-        glink = glink_chain.head
+        glinks = glink_chain.glinks()
+        glink = next(glinks)
         layout = glink.perm.apply(self.archgraph.nodes) # current layout
         routed_circuit = circuit.copy_empty_like()
 
@@ -284,41 +353,54 @@ class QUEKNO:
             print(f"layout: {Permutation().oneline(self.archgraph.nodes)} [it 0]")
             print(f"layout: {glink.perm.oneline(self.archgraph.nodes)} [it 1]")
 
+        # Extract the type and qubit indices of every gate once, as gates are revisited
+        # after each layout update (gate type is None for barriers)
+        gates = []
+        for gate in circuit.data:
+            if gate.operation.name == "barrier":
+                gate_type = None
+            elif gate.operation == ONE_QUBIT_GATE:
+                gate_type = ONE_QUBIT_GATE
+            elif gate.operation == TWO_QUBIT_GATE:
+                gate_type = TWO_QUBIT_GATE
+            else:
+                raise CircuitError(f"unknown gate '{gate.operation.name}'")
+            gates.append((gate_type, tuple(qubit._index for qubit in gate.qubits)))
+
+        neighbour_bits = self.__neighbour_bits
         i = 0
         true_cost = 0
-        while i < len(circuit.data):
-            gate = circuit.data[i]
+        while i < len(gates):
+            gate_type, qubits = gates[i]
             
-            if gate.operation.name == "barrier":
+            if gate_type is None:
                 routed_circuit.barrier() # barriers are ignored
 
-            elif gate.operation == ONE_QUBIT_GATE:
-                routed_circuit.append(ONE_QUBIT_GATE, gate.qubits) # add one-qubit gate
+            elif gate_type is ONE_QUBIT_GATE:
+                routed_circuit.append(ONE_QUBIT_GATE, qubits) # add one-qubit gate
 
-            elif gate.operation == TWO_QUBIT_GATE:
-                permuted_qubits = [layout[qubit._index] for qubit in gate.qubits]
-                if not self.archgraph.has_edge(*permuted_qubits):
+            else:
+                src, dst = (layout[qubit] for qubit in qubits)
+                if not neighbour_bits[src] >> dst & 1: # not an edge of archgraph
                     
-                    glink = glink.next
+                    glink = next(glinks, None)
                     if glink is None:
                         raise CircuitError("too few glinks")
                     if verbose:
                         print(f"layout: {glink.perm.oneline(layout)} [it {i + 1}]")
                     
+                    layout_pos = {node: index for index, node in enumerate(layout)}
                     for src, dst in glink.perm.items():
-                        routed_circuit.swap(layout.index(src), layout.index(dst)) # add swaps
+                        routed_circuit.swap(layout_pos[src], layout_pos[dst]) # add swaps
                     layout = glink.perm.apply(layout) # update layout
                     true_cost += len(glink.perm) if self.opt_type != OptType.DEPTH else 1 # update cost
                     continue
                 
-                routed_circuit.append(TWO_QUBIT_GATE, gate.qubits) # add two-qubit gate
-
-            else:
-                raise CircuitError(f"unknown gate '{gate.operation.name}'")
+                routed_circuit.append(TWO_QUBIT_GATE, qubits) # add two-qubit gate
             
             i += 1
         
-        if glink.next is not None:
+        if next(glinks, None) is not None:
             raise CircuitError("too many glinks")
         
         if pred_cost != true_cost:
@@ -363,6 +445,8 @@ class QUEKNO:
 
         # Record results
         gate_counts = circuit.count_ops()
+        gate_size, depth = circuit.size(), circuit.depth()
+        decomposed_circuit = routed_circuit.decompose("swap") # swaps counted as 3 CNOTs
         subgraph_sizes = [glink.graph.num_edges for glink in glink_chain.glinks()]
         results = {
             # parameters
@@ -372,10 +456,10 @@ class QUEKNO:
             "subgraph_size": sum(subgraph_sizes) / len(subgraph_sizes),
             "qbg_ratio": gate_counts[ONE_QUBIT_GATE.name] / gate_counts[TWO_QUBIT_GATE.name],
             # generated circuit
-            "gate_size": circuit.size(),
-            "depth": circuit.depth(),
-            "gate_cost": routed_circuit.decompose("swap").size() - circuit.size(),
-            "depth_cost": routed_circuit.decompose("swap").depth() - circuit.depth(),
+            "gate_size": gate_size,
+            "depth": depth,
+            "gate_cost": decomposed_circuit.size() - gate_size,
+            "depth_cost": decomposed_circuit.depth() - depth,
             # permutations
             "init_map": glink_chain.head.perm.oneline(highlight = False),
             "swaps": [glink.perm.items() for glink in glink_chain.glinks() if glink != glink_chain.head],
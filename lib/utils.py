@@ -1,12 +1,14 @@
 from enum import Enum
 from rustworkx import is_subgraph_isomorphic
-from typing import Iterable, Optional
+from typing import Optional
 
 from .graph import Graph
 from .graph_data import Edge
 from .permutation import Permutation
+from config import VF2_EARLY_ACCEPT_RATIO
 
 VF2_CALL_LIMIT = 10000
+VF2_CACHE_SIZE = 65536 # maximum number of cached VF2 results
 
 
 # === QUEKNO parameters ===
@@ -26,25 +28,13 @@ class QBGRatio(Enum):
     QSE = 2.55
 
 
-def is_disjoint(edges: Iterable[Optional[Edge]]) -> bool:
-    """
-    Check whether the given collection of edges is disjoint.
-
-    Params:
-    - `edges`: an iterable collection of edges
-
-    Returns:
-    - True if `edges` is (pairwise) disjoint.
-    """
-    nodes = [node for edge in edges for node in edge if not edge.is_null]
-    return len(nodes) == len(set(nodes)) # disjoint if no duplicates
-
-
 def is_strong_glink(
     archgraph: Graph,
     prev_subgraph: Graph,
     next_subgraph: Graph,
-    perm: Permutation
+    perm: Permutation,
+    archgraph_degrees: Optional[list[int]] = None,
+    cache: Optional[dict[frozenset[Edge], bool]] = None
 ) -> bool:
     """
     Determine whether the given glink is strong.
@@ -54,10 +44,18 @@ def is_strong_glink(
     - `prev_subgraph`: previous subgraph in the glink
     - `next_subgraph`: next subgraph in the glink
     - `perms`: permutation inducing the glink
+    - `archgraph_degrees`: degree sequence of `archgraph` (computed if not given)
+    - `cache`: if given then VF2 results are looked up in (and added to) this dict, which
+    must only be used with the same `archgraph`
 
     Returns:
     - True if the induced glink is strong
     """
+    # Permuting nodes absent from next_subgraph leaves it unchanged, so skip building the
+    # permuted graph when the permutation involves none of its nodes
+    if perm.support.isdisjoint(next_subgraph.nodes):
+        return False
+
     # Construct permuted graph
     perm_graph = next_subgraph.copy()
     for src, dst in perm.items():
@@ -67,10 +65,41 @@ def is_strong_glink(
     if perm_graph == next_subgraph:
         return False
 
+    # Construct union graph
+    union_graph = prev_subgraph.union(perm_graph)
+
+    # The union graph cannot be embedded in archgraph if it has more edges, or if its k-th
+    # largest degree exceeds that of archgraph for any k (embeddings never decrease degrees)
+    if union_graph.num_edges > archgraph.num_edges:
+        return False
+    if archgraph_degrees is None:
+        archgraph_degrees = archgraph.degree_sequence()
+    if any(map(int.__gt__, union_graph.degree_sequence(), archgraph_degrees)):
+        return False
+
+    # Optionally assume that sufficiently sparse union graphs can be embedded in archgraph
+    # (this is inexact, but skips VF2 for most union graphs)
+    if (
+        VF2_EARLY_ACCEPT_RATIO is not None
+        and union_graph.num_edges <= VF2_EARLY_ACCEPT_RATIO * archgraph.num_edges
+    ):
+        return True
+
+    # Reuse the VF2 result if the same union graph has been seen before (isolated nodes
+    # are irrelevant as the union graph never has more nodes than archgraph)
+    union_key = frozenset(union_graph.edges)
+    if cache is not None and union_key in cache:
+        return cache[union_key]
+
     # Glink is strong if its union graph is not isomorphic to archgraph
-    return is_subgraph_isomorphic(
+    is_strong = is_subgraph_isomorphic(
         archgraph.pygraph(),
-        prev_subgraph.union(perm_graph).pygraph(),
+        union_graph.pygraph(),
         induced = False,
         call_limit = VF2_CALL_LIMIT
     )
+    if cache is not None:
+        if len(cache) >= VF2_CACHE_SIZE:
+            cache.clear()
+        cache[union_key] = is_strong
+    return is_strong
@@ -4,9 +4,10 @@ import sys
 import time
 import warnings
 
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from qiskit import QuantumCircuit, qasm2
-from qiskit.transpiler.passes import RemoveBarriers
 from tqdm import tqdm
+from typing import Optional
 
 from lib import QUEKNO
 from lib.graph_utils import *
@@ -17,6 +18,10 @@ CIRCUITS_ROOT = lambda benchmark: f"out/{benchmark}/circuits"
 CIRCUITS_BARRIERED_ROOT = lambda benchmark: f"out/{benchmark}/circuits_barriered"
 RESULTS_ROOT = lambda benchmark: f"out/{benchmark}/results"
 
+# State of each worker process
+worker_archgraph: Graph # set by init_worker
+worker_builder: Optional[QUEKNO] = None # created (and seeded from the OS) on first use, then reused
+
 
 def benchmark_name(opt: str, archgraph: Graph):
     return f"{archgraph.num_nodes}Q_{opt}_{archgraph.name.capitalize()}"
@@ -29,8 +34,15 @@ def export_circuits(
     is_barriered: bool = True
 ):
     if is_barriered:
-        qasm2.dump(circuit, os.path.join(barriered_root, name + ".qasm"))
-        qasm2.dump(RemoveBarriers()(circuit), os.path.join(root, name + ".qasm"))
+        qasm = qasm2.dumps(circuit) + "\n" # as written by qasm2.dump
+        with open(os.path.join(barriered_root, name + ".qasm"), "w") as f:
+            f.write(qasm)
+
+        # Strip the barriers from the exported text rather than from the circuit
+        with open(os.path.join(root, name + ".qasm"), "w") as f:
+            f.writelines(
+                line for line in qasm.splitlines(keepends = True) if not line.startswith("barrier ")
+            )
     else:
         qasm2.dump(circuit, os.path.join(root, name + ".qasm"))
 
@@ -47,11 +59,40 @@ def export_results(
             elif key == "swaps":
                 f.write(f"{key}:\n")
                 for swap_seq in val:
-                    f.write(", ".join(map(str, swap_seq)) + '\n')
+                    f.write(", ".join(f"{src}-{dst}" for src, dst in swap_seq) + '\n')
             else:
                 val = f"{val:.3f}" if isinstance(val, float) else val # round to 3 sf
                 f.write(f"{key}: {val}\n")
 
+def init_worker(archgraph: Graph):
+
+    global worker_archgraph
+    worker_archgraph = archgraph
+    warnings.filterwarnings("ignore")
+
+def generate_circuit(
+    params: tuple[SubgraphSize, OptType, int, QBGRatio]
+) -> tuple[QuantumCircuit, dict]:
+
+    global worker_builder
+    subgraph_size, opt_type, target_cost, qbg_ratio = params
+    if worker_builder is None:
+        worker_builder = QUEKNO(
+            opt_type = opt_type,
+            target_cost = target_cost,
+            archgraph = worker_archgraph,
+            subgraph_size = subgraph_size,
+            qbg_ratio = qbg_ratio
+        )
+    else:
+        # Reusing the builder keeps its archgraph precomputations and VF2 cache
+        worker_builder.opt_type = opt_type
+        worker_builder.target_cost = target_cost
+        worker_builder.subgraph_size = subgraph_size
+        worker_builder.qbg_ratio = qbg_ratio
+    circuit, _, results = worker_builder.run(add_barriers = True, verbose = False)
+    return circuit, results
+
 def main(objective: str, archgraph: Graph) -> int:
 
     subgraph_sizes = (SubgraphSize.TOKYO,) if isinstance(archgraph, Tokyo) else (SubgraphSize.SMALL, SubgraphSize.LARGE)
@@ -63,40 +104,52 @@ def main(objective: str, archgraph: Graph) -> int:
     num_circuits = len(subgraph_sizes) * len(opt_types) * len(target_costs) * len(qbg_ratios) * 10
     prog_bar = tqdm(total = num_circuits, leave = False)
 
-    params = it.product(subgraph_sizes, opt_types, target_costs, qbg_ratios, range(10))
-    for subgraph_size, opt_type, target_cost, qbg_ratio, i in params:
-        
-        size = "small" if subgraph_size == SubgraphSize.SMALL else "large"
-        opt = "opt" if opt_type.value == OptType.DEPTH else opt_type.value
-        name = f"{benchmark}_{size}_{opt}_{target_cost}_{qbg_ratio.value}_no.{i}"
-        builder = QUEKNO(
-            opt_type = opt_type,
-            target_cost = target_cost,
-            archgraph = archgraph,
-            subgraph_size = subgraph_size,
-            qbg_ratio = qbg_ratio
-        )
-        circuit, _, results = builder.run(add_barriers = True, verbose = False)
-
-        export_circuits(
-            CIRCUITS_ROOT(benchmark),
-            CIRCUITS_BARRIERED_ROOT(benchmark),
-            name,
-            circuit,
-            is_barriered = True
-        )
-        export_results(
-            RESULTS_ROOT(benchmark),
-            name,
-            results
-        )
-        prog_bar.set_description(name, refresh = False)
-        displayed = prog_bar.update()
-        if not displayed:
-            prog_bar.refresh()
+    params = list(it.product(subgraph_sizes, opt_types, target_costs, qbg_ratios, range(10)))
+    exports: list[Future] = []
+    with (
+        ProcessPoolExecutor(NUM_WORKERS, initializer = init_worker, initargs = (archgraph,)) as executor,
+        ThreadPoolExecutor(NUM_IO_THREADS) as io_executor
+    ):
+        outputs = executor.map(generate_circuit, [param[:-1] for param in params], chunksize = 8)
+
+        # Circuits are generated in parallel and handed off, in order, to be exported in the
+        # background; if any fails, pending work is cancelled so that the error surfaces at once
+        try:
+            for (subgraph_size, opt_type, target_cost, qbg_ratio, i), (circuit, results) in zip(params, outputs):
+                
+                size = "small" if subgraph_size == SubgraphSize.SMALL else "large"
+                opt = "opt" if opt_type.value == OptType.DEPTH else opt_type.value
+                name = f"{benchmark}_{size}_{opt}_{target_cost}_{qbg_ratio.value}_no.{i}"
+
+                exports.append(io_executor.submit(
+                    export_circuits,
+                    CIRCUITS_ROOT(benchmark),
+                    CIRCUITS_BARRIERED_ROOT(benchmark),
+                    name,
+                    circuit,
+                    is_barriered = True
+                ))
+                exports.append(io_executor.submit(
+                    export_results,
+                    RESULTS_ROOT(benchmark),
+                    name,
+                    results
+                ))
+                prog_bar.set_description(name, refresh = False)
+                displayed = prog_bar.update()
+                if not displayed:
+                    prog_bar.refresh()
+        except BaseException:
+            executor.shutdown(wait = False, cancel_futures = True)
+            io_executor.shutdown(wait = False, cancel_futures = True)
+            raise
     
     prog_bar.close()
 
+    # Re-raise any error encountered while exporting
+    for export in exports:
+        export.result()
+
     return num_circuits
 
 